@@ -1,9 +1,13 @@
 
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import logging
+import queue
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PgConfig:
     host: str = "localhost"
     port: int = 5432
@@ -14,14 +18,24 @@ class PgConfig:
 
 
 def setup_logging():
-    logging.basicConfig(
-        filename='app.log',
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        encoding='utf-8'
-    )
-
-STYLES = {
+    log_queue = queue.Queue(-1)
+    file_handler = logging.FileHandler('app.log', encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+
+    def shutdown():
+        listener.stop()
+        file_handler.close()
+
+    atexit.register(shutdown)
+
+STYLES = MappingProxyType({
     "primary_color": "#5b856a",
     "secondary_color": "#345e49",
     "accent_color": "#34db69",
@@ -32,4 +46,4 @@ STYLES = {
     "dark_color": "#182e20",
     "text_color": "#2c503a",
     "background_color": "#f8f9fa"
-}
\ No newline at end of file
+})
\ No newline at end of file
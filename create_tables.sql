@@ -1,6 +1,6 @@
 DO $$ 
 BEGIN
-    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'attack_type') THEN
+    IF to_regtype('attack_type') IS NULL THEN
         CREATE TYPE attack_type AS ENUM ('udp_flood', 'icmp_flood', 'http_flood', 'syn_flood');
     END IF;
 END $$;
@@ -39,4 +39,35 @@ CREATE TABLE IF NOT EXISTS ddos_attacks (
     
     CONSTRAINT chk_duration_reasonable 
         CHECK (duration_seconds <= 86400)  
-);
\ No newline at end of file
+);
+
+CREATE INDEX IF NOT EXISTS idx_attacks_time_type
+    ON ddos_attacks ("timestamp" DESC, attack_type)
+    INCLUDE (source_ip, target_ip, packet_count);
+
+
+CREATE INDEX IF NOT EXISTS idx_attacks_time_id
+    ON ddos_attacks ("timestamp", attack_id);
+
+CREATE INDEX IF NOT EXISTS idx_attacks_type
+    ON ddos_attacks (attack_type);
+
+CREATE INDEX IF NOT EXISTS idx_attacks_detected_by_model
+    ON ddos_attacks (detected_by_model_id);
+
+CREATE OR REPLACE FUNCTION notify_table_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('table_changed', TG_TABLE_NAME || ':' || current_setting('application_name'));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_ai_models_changed ON ai_models;
+CREATE TRIGGER trg_ai_models_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ai_models
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_changed();
+
+DROP TRIGGER IF EXISTS trg_ddos_attacks_changed ON ddos_attacks;
+CREATE TRIGGER trg_ddos_attacks_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ddos_attacks
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_changed();
\ No newline at end of file
@@ -1,36 +1,168 @@
 import psycopg2
 from psycopg2 import sql, errors
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from dataclasses import asdict
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+import csv
+import io
 import logging
+import threading
+import uuid
+import weakref
+import zlib
 from config import PgConfig
 
-def create_connection(cfg: PgConfig):
+POOL_MIN_CONNECTIONS = 1
+READONLY_POOL_MIN_CONNECTIONS = 2
+POOL_MAX_CONNECTIONS = 8
+STATEMENT_CACHE_SIZE = 32
+PAGE_SIZE = 200
+INSERT_PAGE_SIZE = 1000
+NOTIFY_CHANNEL = "table_changed"
+APPLICATION_NAME = f"ddos_mlops_{uuid.uuid4().hex[:12]}"
+ATTACK_TYPES = ('udp_flood', 'icmp_flood', 'http_flood', 'syn_flood')
+
+DEMO_ATTACKS = [
+    ('192.168.1.100', '10.0.0.50', 'udp_flood', 10000, 60, [80, 443]),
+    ('fe80::1', '2001:db8::1', 'http_flood', 50000, 120, [8080]),
+    ('172.16.0.10', '10.0.0.100', 'syn_flood', 75000, 30, [22, 3389]),
+]
+
+DEMO_MODELS = [
+    ('DeepPacket', '1.2.0', 'CNN для анализа сетевых пакетов', True),
+    ('FlowAnalyzer', '2.1.5', 'RNN для анализа сетевых потоков', True),
+    ('LegacyDetector', '0.9.1', 'Старая модель на основе правил', False),
+]
+
+DEMO_EXPERIMENTS = [
+    ('Test Run #1 - DeepPacket', 1, 3, 2),
+]
+
+DEMO_RESULTS = [
+    (1, 1, True, 0.99, 150),
+    (1, 2, True, 0.85, 220),
+    (1, 3, False, 0.10, 50),
+]
+
+ATTACK_COLUMNS = ('source_ip', 'target_ip', 'attack_type', 'packet_count', 'duration_seconds', 'target_ports')
+RESULT_COLUMNS = ('experiment_id', 'attack_id', 'is_detected', 'confidence', 'detection_time_ms')
+
+_pool = None
+_ro_pool = None
+_pool_cfg = None
+_pool_lock = threading.Lock()
+_prepared = weakref.WeakKeyDictionary()
+_table_meta_cache = {}
+_existing_tables = set()
+_table_versions = defaultdict(int)
+_version_lock = threading.Lock()
+
+class IdlePool(ThreadedConnectionPool):
+    def __init__(self, minconn: int, maxconn: int, **kwargs):
+        super().__init__(minconn, maxconn, **kwargs)
+        # psycopg2 closes returned connections beyond minconn; keep up to maxconn idle instead
+        self.minconn = self.maxconn
+
+def _close_pools():
+   
+    global _pool, _ro_pool, _pool_cfg
+    for pool in (_pool, _ro_pool):
+        if pool is not None:
+            pool.closeall()
+    _pool = None
+    _ro_pool = None
+    _pool_cfg = None
+    _table_meta_cache.clear()
+    _existing_tables.clear()
+
+def _get_pool(cfg: PgConfig) -> IdlePool:
+   
+    global _pool, _ro_pool, _pool_cfg
+    with _pool_lock:
+        if _pool is not None and _pool_cfg != cfg:
+            _close_pools()
+        if _pool is None:
+            _pool = IdlePool(POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, application_name=APPLICATION_NAME, **asdict(cfg))
+            _ro_pool = IdlePool(READONLY_POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, application_name=APPLICATION_NAME, **asdict(cfg))
+            _pool_cfg = cfg
+        return _pool
+
+def open_pool(cfg: PgConfig) -> bool:
    
     try:
-        conn = psycopg2.connect(
-            host=cfg.host,
-            port=cfg.port,
-            dbname=cfg.dbname,
-            user=cfg.user,
-            password=cfg.password,
-            sslmode=cfg.sslmode
-        )
+        _get_pool(cfg)
         logging.info("Успешное подключение к PostgreSQL")
-        return conn
+        return True
     except Exception as e:
-        logging.error(f"Ошибка подключения: {e}")
-        return None
+        logging.error("Ошибка подключения: %s", e)
+        return False
+
+@contextmanager
+def pooled_connection(readonly: bool = False):
+   
+    with _pool_lock:
+        pool = _ro_pool if readonly else _pool
+    if pool is None or pool.closed:
+        raise psycopg2.InterfaceError("Пул соединений не инициализирован")
+    conn = pool.getconn()
+    try:
+        if readonly and not conn.autocommit:
+            conn.set_session(readonly=True, autocommit=True)
+        yield conn
+    finally:
+        if pool.closed:
+            conn.close()
+        else:
+            pool.putconn(conn)
+
+def open_listener(channel: str = NOTIFY_CHANNEL):
+   
+    with _pool_lock:
+        cfg = _pool_cfg
+    if cfg is None:
+        raise psycopg2.InterfaceError("Пул соединений не инициализирован")
+    conn = psycopg2.connect(**asdict(cfg))
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+    return conn
+
+def parse_notify(payload: str):
+   
+    table_name, _, origin = payload.partition(":")
+    return table_name, origin == APPLICATION_NAME
+
+def close_pool():
+   
+    with _pool_lock:
+        _close_pools()
+
+def bump_table_version(*table_names: str):
+   
+    with _version_lock:
+        for table_name in table_names:
+            _table_versions[table_name] += 1
+
+def table_version(table_name: str) -> int:
+   
+    with _version_lock:
+        return _table_versions[table_name]
 
 def execute_sql_script(conn, script: str):
    
     try:
         with conn.cursor() as cur:
+            cur.execute("SET LOCAL synchronous_commit TO OFF")
             cur.execute(script)
         conn.commit()
         logging.info("SQL-скрипт выполнен успешно")
         return True
     except Exception as e:
         conn.rollback()
-        logging.error(f"Ошибка выполнения SQL-скрипта: {e}")
+        logging.error("Ошибка выполнения SQL-скрипта: %s", e)
         return False
 
 def insert_demo_data(conn):
@@ -39,90 +171,358 @@ def insert_demo_data(conn):
         with conn:
             with conn.cursor() as cur:
               
-                cur.execute("SELECT COUNT(*) FROM ai_models")
-                if cur.fetchone()[0] > 0:
+                cur.execute("""
+                    SELECT (SELECT COUNT(*) FROM ai_models),
+                           to_regclass('experiments') IS NOT NULL
+                           AND to_regclass('experiment_results') IS NOT NULL
+                """)
+                model_count, has_experiments = cur.fetchone()
+                if model_count > 0:
                     logging.info("Демо-данные уже существуют")
                     return True
                 
               
-                cur.execute("""
-                    INSERT INTO ai_models (name, version, description, is_active) VALUES
-                    ('DeepPacket', '1.2.0', 'CNN для анализа сетевых пакетов', TRUE),
-                    ('FlowAnalyzer', '2.1.5', 'RNN для анализа сетевых потоков', TRUE),
-                    ('LegacyDetector', '0.9.1', 'Старая модель на основе правил', FALSE)
-                """)
-                
-               
-                cur.execute("""
-                    INSERT INTO ddos_attacks (source_ip, target_ip, attack_type, packet_count, duration_seconds, target_ports) VALUES
-                    ('192.168.1.100', '10.0.0.50', 'udp_flood', 10000, 60, ARRAY[80, 443]),
-                    ('fe80::1', '2001:db8::1', 'http_flood', 50000, 120, ARRAY[8080]),
-                    ('172.16.0.10', '10.0.0.100', 'syn_flood', 75000, 30, ARRAY[22, 3389])
-                """)
-                
-               
-                cur.execute("""
-                    INSERT INTO experiments (name, model_id, total_attacks, detected_attacks) VALUES
-                    ('Test Run #1 - DeepPacket', 1, 3, 2)
-                """)
-                
-               
-                cur.execute("""
-                    INSERT INTO experiment_results (experiment_id, attack_id, is_detected, confidence, detection_time_ms) VALUES
-                    (1, 1, TRUE, 0.99, 150),
-                    (1, 2, TRUE, 0.85, 220),
-                    (1, 3, FALSE, 0.10, 50)
-                """)
+                _copy_rows(cur, "ddos_attacks", ATTACK_COLUMNS, _csv_buffer(DEMO_ATTACKS))
+                execute_values(
+                    cur,
+                    "INSERT INTO ai_models (name, version, description, is_active) VALUES %s",
+                    DEMO_MODELS,
+                    page_size=INSERT_PAGE_SIZE
+                )
+
+                if not has_experiments:
+                    logging.info("Таблицы экспериментов отсутствуют, демо-эксперименты пропущены")
+                else:
+                    execute_values(
+                        cur,
+                        "INSERT INTO experiments (name, model_id, total_attacks, detected_attacks) VALUES %s",
+                        DEMO_EXPERIMENTS,
+                        page_size=INSERT_PAGE_SIZE
+                    )
+                    _copy_rows(cur, "experiment_results", RESULT_COLUMNS, _csv_buffer(DEMO_RESULTS))
         
+        bump_table_version("ddos_attacks", "ai_models", "experiments", "experiment_results")
         logging.info("Демо-данные успешно добавлены")
         return True
         
     except Exception as e:
-        logging.error(f"Ошибка вставки демо-данных: {e}")
+        logging.error("Ошибка вставки демо-данных: %s", e)
         conn.rollback()
         return False
 
-def fetch_data(conn, table_name: str):
-    
+def _csv_buffer(rows) -> io.StringIO:
+   
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([
+            "{%s}" % ",".join(map(str, value)) if isinstance(value, list) else value
+            for value in row
+        ])
+    buf.seek(0)
+    return buf
+
+def _copy_rows(cur, table_name: str, columns, source, header: bool = False) -> int:
+   
+    cur.copy_expert(
+        sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT CSV, HEADER {})").format(
+            sql.Identifier(table_name),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+            sql.SQL("TRUE" if header else "FALSE")
+        ),
+        source
+    )
+    return cur.rowcount
+
+def _copy_attacks(conn, source, header: bool = False) -> int:
+   
+    with conn:
+        with conn.cursor() as cur:
+            count = _copy_rows(cur, "ddos_attacks", ATTACK_COLUMNS, source, header)
+    bump_table_version("ddos_attacks")
+    logging.info("Загружено атак через COPY: %s", count)
+    return count
+
+def copy_attacks(conn, rows) -> int:
+   
+    try:
+        return _copy_attacks(conn, _csv_buffer(rows))
+    except Exception as e:
+        logging.error("Ошибка массовой загрузки атак: %s", e)
+        conn.rollback()
+        return 0
+
+def load_attacks_csv(conn, path: str) -> int:
+   
+    with open(path, encoding="utf-8", newline="") as f:
+        return _copy_attacks(conn, f, header=True)
+
+def _execute_prepared(cur, name: str, query: sql.Composable, params: tuple = ()):
+   
+    cache = _prepared.setdefault(cur.connection, OrderedDict())
+    if name in cache:
+        cache.move_to_end(name)
+    else:
+        cur.execute(sql.SQL("PREPARE {} AS {}").format(sql.Identifier(name), query))
+        cache[name] = True
+        if len(cache) > STATEMENT_CACHE_SIZE:
+            stale, _ = cache.popitem(last=False)
+            cur.execute(sql.SQL("DEALLOCATE {}").format(sql.Identifier(stale)))
+    if params:
+        cur.execute(
+            sql.SQL("EXECUTE {} ({})").format(
+                sql.Identifier(name),
+                sql.SQL(", ").join(sql.Placeholder() * len(params))
+            ),
+            params
+        )
+    else:
+        cur.execute(sql.SQL("EXECUTE {}").format(sql.Identifier(name)))
+
+def _reset_prepared(conn):
+   
+    _prepared.pop(conn, None)
     try:
+        conn.rollback()
         with conn.cursor() as cur:
-            cur.execute(sql.SQL("SELECT * FROM {}").format(sql.Identifier(table_name)))
-            columns = [desc[0] for desc in cur.description]
+            cur.execute("DEALLOCATE ALL")
+    except Exception as e:
+        logging.error("Ошибка сброса подготовленных запросов: %s", e)
+
+def _table_meta(conn, table_name: str):
+   
+    if table_name not in _table_meta_cache:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT a.attname, i.indrelid IS NOT NULL
+                FROM pg_attribute a
+                LEFT JOIN pg_index i
+                    ON i.indrelid = a.attrelid AND i.indisprimary AND a.attnum = ANY(i.indkey)
+                WHERE a.attrelid = to_regclass(%s) AND a.attnum > 0 AND NOT a.attisdropped
+                ORDER BY a.attnum
+                """,
+                (table_name,)
+            )
             rows = cur.fetchall()
-            return columns, rows
+        if not rows:
+            return [], None
+        columns = [name for name, _ in rows]
+        pk_column = next((name for name, is_pk in rows if is_pk), columns[0])
+        _table_meta_cache[table_name] = (columns, pk_column)
+    return _table_meta_cache[table_name]
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _page_queries(table_name: str, columns: tuple, pk_column: str, order_by: str, descending: bool):
+   
+    projection = sql.SQL(", ").join(map(sql.Identifier, columns))
+    table, pk, key = sql.Identifier(table_name), sql.Identifier(pk_column), sql.Identifier(order_by)
+    direction = sql.SQL("DESC" if descending else "ASC")
+    op = sql.SQL("<" if descending else ">")
+    by_pk = sql.SQL("{} {}").format(pk, direction)
+    by_key = sql.SQL("{} {}, {} {}").format(key, direction, pk, direction)
+    suffix = "%s_%s_%s_%08x" % (
+        table_name, order_by, "d" if descending else "a", zlib.crc32(",".join(columns).encode())
+    )
+
+    def page(kind, where, ordering, limit):
+        query = sql.SQL("SELECT {} FROM {}{} ORDER BY {} LIMIT {}").format(
+            projection, table, sql.SQL(" WHERE ") + where if where else sql.SQL(""), ordering, sql.SQL(limit)
+        )
+        return f"page_{kind}_{suffix}", query
+
+    if order_by == pk_column:
+        return {
+            "first": page("first", None, by_pk, "$1"),
+            "next": page("next", sql.SQL("{} {} $1").format(pk, op), by_pk, "$2"),
+        }
+    return {
+        "first": page("first", None, by_key, "$1"),
+        "next": page("next", sql.SQL("({}, {}) {} ($1, $2)").format(key, pk, op), by_key, "$3"),
+        "keyed": page("keyed", sql.SQL("{} IS NOT NULL").format(key), by_key, "$1"),
+        "null_next": page("null_next", sql.SQL("{} IS NULL AND {} {} $1").format(key, pk, op), by_pk, "$2"),
+        "nulls": page("nulls", sql.SQL("{} IS NULL").format(key), by_pk, "$1"),
+    }
+
+def fetch_page(conn, table_name: str, limit: int = PAGE_SIZE, after=None,
+               columns=None, order_by=None, descending: bool = False):
+    
+    try:
+        table_columns, pk_column = _table_meta(conn, table_name)
+        if not table_columns:
+            logging.error("Таблица %s не найдена", table_name)
+            return [], [], None
+        order_by = order_by if order_by in table_columns else pk_column
+        columns = [c for c in columns if c in table_columns] if columns else list(table_columns)
+        for required in (pk_column, order_by):
+            if required not in columns:
+                columns.append(required)
+        queries = _page_queries(table_name, tuple(columns), pk_column, order_by, descending)
+
+        with conn.cursor() as cur:
+            def run(kind, *params):
+                _execute_prepared(cur, *queries[kind], params)
+                return cur.fetchall()
+
+            if after is None:
+                rows = run("first", limit)
+            elif order_by == pk_column:
+                rows = run("next", after[1], limit)
+            elif after[0] is None:
+                # NULL keys sort first descending (PostgreSQL default), so the keyed rows follow them
+                rows = run("null_next", after[1], limit)
+                if descending and len(rows) < limit:
+                    rows += run("keyed", limit - len(rows))
+            else:
+                rows = run("next", after[0], after[1], limit)
+                if not descending and len(rows) < limit:
+                    rows += run("nulls", limit - len(rows))
+            return columns, rows, pk_column
     except Exception as e:
-        logging.error(f"Ошибка получения данных из {table_name}: {e}")
-        return [], []
+        logging.error("Ошибка получения данных из %s: %s", table_name, e)
+        _reset_prepared(conn)
+        return [], [], None
 
 def check_table_exists(conn, table_name: str) -> bool:
   
+    if table_name in _existing_tables:
+        return True
     try:
         with conn.cursor() as cur:
-            cur.execute(
-                "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = %s)",
+            _execute_prepared(
+                cur,
+                "check_table_exists",
+                sql.SQL("SELECT to_regclass($1) IS NOT NULL"),
                 (table_name,)
             )
-            return cur.fetchone()[0]
+            exists = cur.fetchone()[0]
+        if exists:
+            _existing_tables.add(table_name)
+        return exists
     except Exception as e:
-        logging.error(f"Ошибка проверки таблицы {table_name}: {e}")
+        logging.error("Ошибка проверки таблицы %s: %s", table_name, e)
+        _reset_prepared(conn)
         return False
 
+def forget_table(table_name: str):
+   
+    _existing_tables.discard(table_name)
+    _table_meta_cache.pop(table_name, None)
+
+def _fetch_record(cur) -> dict:
+   
+    row = cur.fetchone()
+    return dict(zip((col.name for col in cur.description), row))
+
+def estimate_row_count(conn, table_name: str):
+   
+    try:
+        with conn.cursor() as cur:
+            _execute_prepared(
+                cur,
+                "estimate_row_count",
+                sql.SQL("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass($1)"),
+                (table_name,)
+            )
+            row = cur.fetchone()
+        return row[0] if row and row[0] >= 0 else None
+    except Exception as e:
+        logging.error("Ошибка оценки числа строк %s: %s", table_name, e)
+        _reset_prepared(conn)
+        return None
+
+def insert_model(conn, name: str, version: str, description: str, is_active: bool):
+   
+    with conn:
+        with conn.cursor() as cur:
+            _execute_prepared(
+                cur,
+                "insert_model",
+                sql.SQL("INSERT INTO ai_models (name, version, description, is_active) VALUES ($1, $2, $3, $4) RETURNING *"),
+                (name, version, description, is_active)
+            )
+            record = _fetch_record(cur)
+    bump_table_version("ai_models")
+    return record
+
+def insert_attack(conn, source_ip: str, target_ip: str, attack_type: str,
+                  packet_count: int, duration: int, target_ports=None):
+   
+    with conn:
+        with conn.cursor() as cur:
+            if target_ports:
+                _execute_prepared(
+                    cur,
+                    "insert_attack_ports",
+                    sql.SQL("INSERT INTO ddos_attacks (source_ip, target_ip, attack_type, packet_count, duration_seconds, target_ports) VALUES ($1, $2, $3, $4, $5, $6) RETURNING *"),
+                    (source_ip, target_ip, attack_type, packet_count, duration, target_ports)
+                )
+            else:
+                _execute_prepared(
+                    cur,
+                    "insert_attack",
+                    sql.SQL("INSERT INTO ddos_attacks (source_ip, target_ip, attack_type, packet_count, duration_seconds) VALUES ($1, $2, $3, $4, $5) RETURNING *"),
+                    (source_ip, target_ip, attack_type, packet_count, duration)
+                )
+            record = _fetch_record(cur)
+    bump_table_version("ddos_attacks")
+    return record
+
+def insert_models(conn, rows) -> int:
+   
+    rows = list(rows)
+    with conn:
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                "INSERT INTO ai_models (name, version, description, is_active) VALUES %s",
+                rows,
+                page_size=INSERT_PAGE_SIZE
+            )
+    bump_table_version("ai_models")
+    return len(rows)
+
+def insert_attacks(conn, rows) -> int:
+   
+    rows = list(rows)
+    with conn:
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                "INSERT INTO ddos_attacks (source_ip, target_ip, attack_type, packet_count, duration_seconds, target_ports) VALUES %s",
+                rows,
+                template="(%s, %s, %s, %s, %s, %s::int[])",
+                page_size=INSERT_PAGE_SIZE
+            )
+    bump_table_version("ddos_attacks")
+    return len(rows)
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _delete_query(table_name: str, pk_column: str) -> sql.Composed:
+   
+    return sql.SQL("DELETE FROM {} WHERE {} = $1").format(
+        sql.Identifier(table_name),
+        sql.Identifier(pk_column)
+    )
+
 def delete_record(conn, table_name: str, pk_column: str, pk_value) -> bool:
    
     try:
         with conn:
             with conn.cursor() as cur:
-                query = sql.SQL("DELETE FROM {} WHERE {} = %s").format(
-                    sql.Identifier(table_name),
-                    sql.Identifier(pk_column)
+                _execute_prepared(
+                    cur,
+                    f"delete_{table_name}_{pk_column}",
+                    _delete_query(table_name, pk_column),
+                    (pk_value,)
                 )
-                cur.execute(query, (pk_value,))
                 if cur.rowcount == 0:
-                    logging.warning(f"Запись с {pk_column} = {pk_value} в таблице {table_name} не найдена")
+                    logging.warning("Запись с %s = %s в таблице %s не найдена", pk_column, pk_value, table_name)
                     return False
-        logging.info(f"Запись с {pk_column} = {pk_value} успешно удалена из {table_name}")
+        bump_table_version(table_name)
+        logging.info("Запись с %s = %s успешно удалена из %s", pk_column, pk_value, table_name)
         return True
     except Exception as e:
-        logging.error(f"Ошибка удаления записи из {table_name}: {e}")
-        conn.rollback()
+        logging.error("Ошибка удаления записи из %s: %s", table_name, e)
+        _reset_prepared(conn)
         return False
\ No newline at end of file
@@ -1,12 +1,15 @@
 
 import sys
 import faulthandler
-from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget
+from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget
+from PySide6.QtCore import QTimer
 from config import setup_logging
+from database import close_pool
+from workers import TableWatcher
 from widgets import SetupTab, AIModelsTab, AttacksTab
 from styles import get_app_stylesheet
 
-faulthandler.enable()
+REFRESH_DEBOUNCE_MS = 100
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -15,45 +18,94 @@ class MainWindow(QMainWindow):
         self.resize(1400, 900)
         self.setStyleSheet(get_app_stylesheet())
         
-        self.conn = None
+        self.connected = False
         self.tabs = QTabWidget()
+        self.tabs.currentChanged.connect(self._materialize_tab)
+        self._lazy_tabs = {}
         
         self.setup_tab = SetupTab()
         self.tabs.addTab(self.setup_tab, "Подключение")
         
         self.ai_models_tab = None
         self.attacks_tab = None
+        self.watcher = None
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_DEBOUNCE_MS)
+        self._refresh_timer.timeout.connect(self._do_refresh_all)
 
         self.setCentralWidget(self.tabs)
 
-    def on_connection_established(self, conn):
+    def on_connection_established(self):
        
-        self.conn = conn
+        self.connected = True
         self.setup_tabs()
+        self.watcher = TableWatcher(self)
+        self.watcher.changed.connect(self.refresh_all_tabs)
+        self.watcher.start()
 
     def on_connection_closed(self):
       
-        self.conn = None
+        self.connected = False
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher.deleteLater()
+            self.watcher = None
         self.close_tabs()
 
     def setup_tabs(self):
        
-        if self.conn:
-            self.ai_models_tab = AIModelsTab(self.conn)
-            self.tabs.addTab(self.ai_models_tab, "Модели ИИ")
-            
-            self.attacks_tab = AttacksTab(self.conn)
-            self.tabs.addTab(self.attacks_tab, "DDoS Атаки")
+        if self.connected and self.tabs.count() > 1:
+            self._reconnect_tabs()
+        elif self.connected:
+            for attr, factory, title in (
+                ("ai_models_tab", AIModelsTab, "Модели ИИ"),
+                ("attacks_tab", AttacksTab, "DDoS Атаки"),
+            ):
+                placeholder = QWidget()
+                self._lazy_tabs[placeholder] = (attr, factory)
+                self.tabs.addTab(placeholder, title)
+
+    def _materialize_tab(self, index):
+       
+        placeholder = self.tabs.widget(index)
+        if placeholder not in self._lazy_tabs:
+            return
+        attr, factory = self._lazy_tabs.pop(placeholder)
+        tab = factory()
+        setattr(self, attr, tab)
+        title = self.tabs.tabText(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, tab, title)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+
+    def _reconnect_tabs(self):
+       
+        for index in range(1, self.tabs.count()):
+            self.tabs.setTabEnabled(index, True)
+        for tab in (self.ai_models_tab, self.attacks_tab):
+            if tab is not None:
+                tab.refresh_data(force=True)
 
     def close_tabs(self):
         
-        for i in range(self.tabs.count() - 1, 0, -1):
-            self.tabs.removeTab(i)
-        self.ai_models_tab = None
-        self.attacks_tab = None
+        self.tabs.setCurrentWidget(self.setup_tab)
+        for index in range(1, self.tabs.count()):
+            self.tabs.setTabEnabled(index, False)
+        for tab in (self.ai_models_tab, self.attacks_tab):
+            if tab is not None:
+                tab.model.clear()
 
     def refresh_all_tabs(self):
        
+        self._refresh_timer.start()
+
+    def _do_refresh_all(self):
+       
         if self.ai_models_tab:
             self.ai_models_tab.refresh_data()
         if self.attacks_tab:
@@ -72,7 +124,10 @@ def main():
     win.show()
     
    
-    sys.exit(app.exec())
+    faulthandler.enable()
+    exit_code = app.exec()
+    close_pool()
+    sys.exit(exit_code)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
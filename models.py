@@ -1,21 +1,187 @@
 
-from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
-from database import fetch_data
+from datetime import datetime
+from decimal import Decimal
+from difflib import SequenceMatcher
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThreadPool
+from database import PAGE_SIZE, table_version
+from workers import FetchRunnable
+
+CELL_FORMATTERS = {
+    type(None): lambda value: "",
+    datetime: lambda value: value.strftime("%Y-%m-%d %H:%M:%S"),
+    list: lambda value: ", ".join(map(str, value)),
+}
+
+NUMERIC_TYPES = (int, float, Decimal)
+NUMERIC_ALIGNMENT = int(Qt.AlignRight | Qt.AlignVCenter)
+TEXT_ALIGNMENT = int(Qt.AlignLeft | Qt.AlignVCenter)
+ITEM_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+def format_row(row) -> tuple:
+    return tuple(CELL_FORMATTERS.get(type(value), str)(value) for value in row)
+
+def column_alignments(rows, width: int, known=()) -> tuple:
+    alignments = []
+    for column in range(width):
+        if column < len(known) and known[column] is not None:
+            alignments.append(known[column])
+            continue
+        value = next((row[column] for row in rows if row[column] is not None), None)
+        if value is None:
+            alignments.append(None)
+        elif isinstance(value, NUMERIC_TYPES) and not isinstance(value, bool):
+            alignments.append(NUMERIC_ALIGNMENT)
+        else:
+            alignments.append(TEXT_ALIGNMENT)
+    return tuple(alignments)
 
 class PostgreSQLTableModel(QAbstractTableModel):
-    def __init__(self, conn, table_name: str, parent=None):
+    def __init__(self, table_name: str, parent=None, columns=None):
         super().__init__(parent)
-        self.conn = conn
         self.table_name = table_name
+        self.page_size = PAGE_SIZE
+        self.visible_columns = columns
+        self.order_by = None
+        self.descending = True
         self.columns = []
         self.rows = []
+        self._text_rows = []
+        self._alignments = ()
+        self._pk_index = 0
+        self._order_index = 0
+        self._exhausted = True
+        self._pending = None
+        self._limit = self.page_size
+        self._reset = False
+        self._version = None
+        self._request_version = None
+        self._loaded_order = None
         self.refresh()
 
-    def refresh(self):
+    def refresh(self, force: bool = False):
+        if not force and self._pending is None and self._version == table_version(self.table_name):
+            return
+        limit = self.page_size
+        if (self.order_by, self.descending) == self._loaded_order:
+            limit = max(len(self.rows), limit)
+        self._request_page(None, reset=True, limit=limit)
+
+    def clear(self):
         self.beginResetModel()
-        self.columns, self.rows = fetch_data(self.conn, self.table_name)
+        self.columns, self.rows, self._text_rows = [], [], []
+        self._alignments = ()
+        self._pending = None
+        self._exhausted = True
+        self._version = None
+        self._loaded_order = None
         self.endResetModel()
 
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and self._pending is None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent) and self.rows:
+            last = self.rows[-1]
+            self._request_page((last[self._order_index], last[self._pk_index]))
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        if not 0 <= column < len(self.columns):
+            return
+        self.order_by = self.columns[column]
+        self.descending = order == Qt.DescendingOrder
+        self.refresh(force=True)
+
+    def _request_page(self, after, reset=False, limit=None):
+        self._limit = limit or self.page_size
+        job = FetchRunnable(
+            self.table_name, after, self._limit,
+            self.visible_columns, self.order_by, self.descending
+        )
+        job.signals.page.connect(self._on_page)
+        self._pending = job.signals
+        self._reset = reset
+        if reset:
+            self._request_version = table_version(self.table_name)
+        QThreadPool.globalInstance().start(job)
+
+    def _on_page(self, columns, rows, pk_column):
+        if self.sender() is not self._pending:
+            return
+        self._pending = None
+        self._exhausted = len(rows) < self._limit
+        if self._reset:
+            self._version = self._request_version if columns else None
+            order = (self.order_by, self.descending)
+            if columns and columns == self.columns and order == self._loaded_order:
+                self._merge_rows(list(rows))
+                self._fill_alignments(rows)
+                return
+            self.beginResetModel()
+            self.columns, self.rows = columns, list(rows)
+            self._text_rows = [format_row(row) for row in self.rows]
+            self._alignments = column_alignments(self.rows, len(columns))
+            self._loaded_order = order
+            self._pk_index = columns.index(pk_column) if pk_column in columns else 0
+            self._order_index = columns.index(self.order_by) if self.order_by in columns else self._pk_index
+            self.endResetModel()
+        elif rows:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.rows.extend(rows)
+            self._text_rows.extend(format_row(row) for row in rows)
+            self.endInsertRows()
+            self._fill_alignments(rows)
+
+    def _fill_alignments(self, rows):
+        if None in self._alignments:
+            self._alignments = column_alignments(rows, len(self.columns), self._alignments)
+
+    def _merge_rows(self, rows):
+        old_keys = [row[self._pk_index] for row in self.rows]
+        new_keys = [row[self._pk_index] for row in rows]
+        opcodes = SequenceMatcher(None, old_keys, new_keys, autojunk=False).get_opcodes()
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    if self.rows[i1 + offset] != rows[j1 + offset]:
+                        self.rows[i1 + offset] = rows[j1 + offset]
+                        self._text_rows[i1 + offset] = format_row(rows[j1 + offset])
+                        self.dataChanged.emit(
+                            self.index(i1 + offset, 0),
+                            self.index(i1 + offset, len(self.columns) - 1)
+                        )
+                continue
+            if i2 > i1:
+                self.beginRemoveRows(QModelIndex(), i1, i2 - 1)
+                del self.rows[i1:i2]
+                del self._text_rows[i1:i2]
+                self.endRemoveRows()
+            if j2 > j1:
+                self.beginInsertRows(QModelIndex(), i1, i1 + j2 - j1 - 1)
+                self.rows[i1:i1] = rows[j1:j2]
+                self._text_rows[i1:i1] = map(format_row, rows[j1:j2])
+                self.endInsertRows()
+
+    def append_row(self, record: dict) -> bool:
+        if self._pending is not None or not self.columns:
+            return False
+        if self._order_index != self._pk_index:
+            return False
+        row = tuple(record.get(column) for column in self.columns)
+        self._fill_alignments([row])
+        if self.descending:
+            self.beginInsertRows(QModelIndex(), 0, 0)
+            self.rows.insert(0, row)
+            self._text_rows.insert(0, format_row(row))
+            self.endInsertRows()
+        elif self._exhausted:
+            position = len(self.rows)
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.rows.append(row)
+            self._text_rows.append(format_row(row))
+            self.endInsertRows()
+        return True
+
     def rowCount(self, parent=QModelIndex()) -> int:
         return len(self.rows)
 
@@ -23,11 +189,31 @@ class PostgreSQLTableModel(QAbstractTableModel):
         return len(self.columns)
 
     def data(self, index: QModelIndex, role=Qt.DisplayRole):
-        if not index.isValid() or role != Qt.DisplayRole:
-            return None
-        return str(self.rows[index.row()][index.column()])
+        if role == Qt.DisplayRole:
+            row = index.row()
+            if row < 0:
+                return None
+            return self._text_rows[row][index.column()]
+        if role == Qt.TextAlignmentRole and index.isValid():
+            alignment = self._alignments[index.column()]
+            return TEXT_ALIGNMENT if alignment is None else alignment
+        return None
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return ITEM_FLAGS
 
     def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
             return None
-        return self.columns[section] if orientation == Qt.Horizontal else str(section + 1)
\ No newline at end of file
+        return self.columns[section] if orientation == Qt.Horizontal else str(section + 1)
+
+_shared_models = {}
+
+def shared_model(table_name: str, columns=None) -> PostgreSQLTableModel:
+    key = (table_name, tuple(columns) if columns else None)
+    model = _shared_models.get(key)
+    if model is None:
+        model = _shared_models[key] = PostgreSQLTableModel(table_name, columns=columns)
+    return model
\ No newline at end of file
@@ -1,38 +1,14 @@
 
-from PySide6.QtWidgets import QPushButton, QGroupBox, QTableView
+from PySide6.QtWidgets import QPushButton, QGroupBox, QTableView, QLabel, QHeaderView
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
+from functools import cache
 from config import STYLES
 
-def create_styled_button(text, color=STYLES["accent_color"], font_size=10):
-   
-    button = QPushButton(text)
-    button.setStyleSheet(f"""
-        QPushButton {{
-            background-color: {color};
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 6px;
-            font-weight: bold;
-            font-size: {font_size}px;
-        }}
-        QPushButton:hover {{
-            background-color: {QColor(color).darker(120).name()};
-        }}
-        QPushButton:pressed {{
-            background-color: {QColor(color).darker(150).name()};
-        }}
-        QPushButton:disabled {{
-            background-color: #95a5a6;
-            color: #7f8c8d;
-        }}
-    """)
-    return button
+DEFAULT_BUTTON_FONT_SIZE = 10
+TABLE_ROW_HEIGHT = 24
 
-def create_group_box(title):
-   
-    group = QGroupBox(title)
-    group.setStyleSheet("""
+GROUP_BOX_QSS = """
         QGroupBox {
             font-weight: bold;
             border: 2px solid #bdc3c7;
@@ -47,13 +23,9 @@ def create_group_box(title):
             padding: 0 5px 0 5px;
             color: #2c3e50;
         }
-    """)
-    return group
+"""
 
-def create_table():
-   
-    table = QTableView()
-    table.setStyleSheet("""
+TABLE_QSS = """
         QTableView {
             gridline-color: #bdc3c7;
             background-color: white;
@@ -70,15 +42,103 @@ def create_table():
             border: 1px solid #2c3e50;
             font-weight: bold;
         }
-    """)
+"""
+
+TITLE_COLORS = {
+    "modelsTitle": "#3498db",
+    "attacksTitle": "#e74c3c",
+    "setupTitle": "#2ecc71",
+}
+
+TITLE_QSS = "".join(f"""
+        QLabel#{name} {{
+            font-size: 18px;
+            font-weight: bold;
+            color: white;
+            padding: 10px;
+            background-color: {color};
+            border-radius: 8px;
+        }}
+""" for name, color in TITLE_COLORS.items())
+
+LOG_QSS = """
+        QPlainTextEdit#eventLog {
+            background-color: #2c3e50;
+            color: #ecf0f1;
+            border: 1px solid #34495e;
+            border-radius: 4px;
+            font-family: 'Courier New';
+            font-size: 10px;
+        }
+"""
+
+def _button_name(color, font_size):
+   
+    return f"btn_{color.lstrip('#')}_{font_size}"
+
+@cache
+def _button_qss(color, font_size, selector="QPushButton"):
+   
+    return f"""
+        {selector} {{
+            background-color: {color};
+            color: white;
+            border: none;
+            padding: 8px 16px;
+            border-radius: 6px;
+            font-weight: bold;
+            font-size: {font_size}px;
+        }}
+        {selector}:hover {{
+            background-color: {QColor(color).darker(120).name()};
+        }}
+        {selector}:pressed {{
+            background-color: {QColor(color).darker(150).name()};
+        }}
+        {selector}:disabled {{
+            background-color: #95a5a6;
+            color: #7f8c8d;
+        }}
+    """
+
+_BUTTON_QSS = {
+    color: _button_qss(color, DEFAULT_BUTTON_FONT_SIZE,
+                       f"QPushButton#{_button_name(color, DEFAULT_BUTTON_FONT_SIZE)}")
+    for color in STYLES.values()
+}
+
+def create_styled_button(text, color=STYLES["accent_color"], font_size=DEFAULT_BUTTON_FONT_SIZE):
+   
+    button = QPushButton(text)
+    if font_size == DEFAULT_BUTTON_FONT_SIZE and color in _BUTTON_QSS:
+        button.setObjectName(_button_name(color, font_size))
+    else:
+        button.setStyleSheet(_button_qss(color, font_size))
+    return button
+
+def create_group_box(title):
+   
+    return QGroupBox(title)
+
+def create_title_label(text, name):
+   
+    label = QLabel(text)
+    label.setObjectName(name)
+    label.setAlignment(Qt.AlignCenter)
+    return label
+
+def create_table():
+   
+    table = QTableView()
     table.setAlternatingRowColors(True)
     table.setSelectionBehavior(QTableView.SelectRows)
     table.setSortingEnabled(True)
+    rows = table.verticalHeader()
+    rows.setSectionResizeMode(QHeaderView.Fixed)
+    rows.setDefaultSectionSize(TABLE_ROW_HEIGHT)
     return table
 
-def get_app_stylesheet():
-   
-    return """
+_BASE_QSS = """
         QMainWindow, QWidget {
             background-color: #ecf0f1;
             font-family: 'Segoe UI', Arial, sans-serif;
@@ -89,7 +149,7 @@ def get_app_stylesheet():
             font-size: 11px;
         }
         
-        QLineEdit, QTextEdit, QSpinBox, QComboBox {
+        QLineEdit, QTextEdit, QPlainTextEdit, QSpinBox, QComboBox {
             padding: 6px;
             border: 2px solid #bdc3c7;
             border-radius: 4px;
@@ -97,7 +157,7 @@ def get_app_stylesheet():
             font-size: 11px;
         }
         
-        QLineEdit:focus, QTextEdit:focus, QSpinBox:focus, QComboBox:focus {
+        QLineEdit:focus, QTextEdit:focus, QPlainTextEdit:focus, QSpinBox:focus, QComboBox:focus {
             border-color: #3498db;
         }
         
@@ -124,4 +184,10 @@ def get_app_stylesheet():
         QTabBar::tab:hover {
             background-color: #7f8c8d;
         }
-    """
\ No newline at end of file
+    """
+
+@cache
+def get_app_stylesheet():
+   
+    return (_BASE_QSS + GROUP_BOX_QSS + TABLE_QSS + TITLE_QSS + LOG_QSS
+            + "".join(_BUTTON_QSS.values()))
\ No newline at end of file
@@ -2,37 +2,78 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, 
     QLineEdit, QTextEdit, QCheckBox, QSpinBox, QComboBox,
-    QTextEdit, QMessageBox, QGroupBox
+    QTextEdit, QPlainTextEdit, QMessageBox, QGroupBox, QFileDialog
 )
-from PySide6.QtCore import Qt
-from datetime import datetime
-from database import create_connection, check_table_exists, delete_record
-from models import PostgreSQLTableModel
-from styles import create_styled_button, create_group_box, create_table
+import re
+import time
+from database import (
+    ATTACK_TYPES, open_pool, close_pool, pooled_connection,
+    check_table_exists, forget_table, delete_record, insert_model, insert_attack,
+    insert_models, insert_attacks, load_attacks_csv, estimate_row_count
+)
+from models import shared_model
+from styles import create_styled_button, create_group_box, create_table, create_title_label
 from config import STYLES, PgConfig
+from workers import start_db_task
 from psycopg2 import errors
 
+DISPLAY_COLUMNS = {
+    "ai_models": ["model_id", "name", "version", "is_active", "created_at"],
+    "ddos_attacks": [
+        "attack_id", "source_ip", "target_ip", "attack_type",
+        "packet_count", "duration_seconds", "timestamp", "target_ports"
+    ],
+}
+
+_PORT_RE = re.compile(r"\s*(\d+)(?:\s*-\s*(\d+))?\s*")
+MAX_PORT = 65535
+LOG_MAX_LINES = 500
+
+def parse_ports(text: str):
+   
+    ports = []
+    for part in text.split(','):
+        match = _PORT_RE.fullmatch(part)
+        if not match:
+            raise ValueError(part)
+        first = int(match[1])
+        last = int(match[2] or first)
+        if first > last or last > MAX_PORT:
+            raise ValueError(part)
+        ports.extend(range(first, last + 1))
+    return ports or None
+
+def insert_if_table_exists(table_name: str, insert, *args):
+   
+    with pooled_connection(readonly=True) as conn:
+        if not check_table_exists(conn, table_name):
+            return None
+    with pooled_connection() as conn:
+        try:
+            return insert(conn, *args)
+        except errors.UndefinedTable:
+            forget_table(table_name)
+            return None
+
+def run_readonly(fn, *args):
+   
+    with pooled_connection(readonly=True) as conn:
+        return fn(conn, *args)
+
+def run_readwrite(fn, *args):
+   
+    with pooled_connection() as conn:
+        return fn(conn, *args)
+
 class AIModelsTab(QWidget):
-    def __init__(self, conn, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.conn = conn
-        self.model = PostgreSQLTableModel(conn, "ai_models", self)
+        self.model = shared_model("ai_models", DISPLAY_COLUMNS["ai_models"])
         self.setup_ui()
 
     def setup_ui(self):
        
-        title_label = QLabel("Управление моделями ИИ")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 18px;
-                font-weight: bold;
-                color: white;
-                padding: 10px;
-                background-color: #3498db;
-                border-radius: 8px;
-            }
-        """)
-        title_label.setAlignment(Qt.AlignCenter)
+        title_label = create_title_label("Управление моделями ИИ", "modelsTitle")
 
        
         form_group = create_group_box("Добавить новую модель")
@@ -60,7 +101,7 @@ class AIModelsTab(QWidget):
         self.delete_btn = create_styled_button("Удалить", STYLES["danger_color"])
         self.delete_btn.clicked.connect(self.delete_selected)
         self.refresh_btn = create_styled_button("Обновить", STYLES["accent_color"])
-        self.refresh_btn.clicked.connect(self.refresh_data)
+        self.refresh_btn.clicked.connect(lambda: self.refresh_data(force=True))
 
         buttons_layout = QHBoxLayout()
         buttons_layout.addWidget(self.add_btn)
@@ -97,34 +138,50 @@ class AIModelsTab(QWidget):
             QMessageBox.warning(self, "Ошибка", "Название и версия обязательны")
             return
 
-        if not check_table_exists(self.conn, "ai_models"):
+        self.add_btn.setEnabled(False)
+        start_db_task(
+            insert_if_table_exists, "ai_models", insert_model,
+            name, version, description, is_active,
+            on_finished=self._on_model_added, on_failed=self._on_add_failed
+        )
+
+    def add_models_bulk(self, rows):
+        self.add_btn.setEnabled(False)
+        start_db_task(
+            insert_if_table_exists, "ai_models", insert_models, rows,
+            on_finished=self._on_bulk_added, on_failed=self._on_add_failed
+        )
+
+    def _on_bulk_added(self, count):
+        self.add_btn.setEnabled(True)
+        if count is None:
             QMessageBox.critical(self, "Ошибка", "Таблица 'ai_models' не существует. Создайте её в БД.")
             return
+        self.refresh_data()
+        QMessageBox.information(self, "Успех", f"Добавлено моделей: {count}")
 
-        try:
-            with self.conn:
-                with self.conn.cursor() as cur:
-                    cur.execute(
-                        "INSERT INTO ai_models (name, version, description, is_active) VALUES (%s, %s, %s, %s)",
-                        (name, version, description, is_active)
-                    )
-        
+    def _on_model_added(self, record):
+        self.add_btn.setEnabled(True)
+        if record is None:
+            QMessageBox.critical(self, "Ошибка", "Таблица 'ai_models' не существует. Создайте её в БД.")
+            return
+
+        if not self.model.append_row(record):
             self.refresh_data()
-            self.name_edit.clear()
-            self.version_edit.clear()
-            self.desc_edit.clear()
-            self.active_checkbox.setChecked(True)
-            QMessageBox.information(self, "Успех", "Модель успешно добавлена!")
-        
-        except errors.UniqueViolation:
+        self.name_edit.clear()
+        self.version_edit.clear()
+        self.desc_edit.clear()
+        self.active_checkbox.setChecked(True)
+        QMessageBox.information(self, "Успех", "Модель успешно добавлена!")
+
+    def _on_add_failed(self, e):
+        self.add_btn.setEnabled(True)
+        if isinstance(e, errors.UniqueViolation):
             QMessageBox.critical(self, "Ошибка", "Модель с таким именем и версией уже существует")
-            self.conn.rollback()
-        except errors.ProgrammingError as e:
+        elif isinstance(e, errors.ProgrammingError):
             QMessageBox.critical(self, "Ошибка", f"Ошибка в запросе (возможно, неверный тип данных): {e}")
-            self.conn.rollback()
-        except Exception as e:
+        else:
             QMessageBox.critical(self, "Ошибка", f"Неизвестная ошибка при добавлении: {e}")
-            self.conn.rollback()
 
     def delete_selected(self):
         selected = self.table.selectionModel().selectedRows()
@@ -139,41 +196,43 @@ class AIModelsTab(QWidget):
             return
 
         try:
-            model_id = int(model_id)  
-            if delete_record(self.conn, "ai_models", "model_id", model_id):
-                self.refresh_data()
-                QMessageBox.information(self, "Успех", f"Модель с ID {model_id} удалена")
-            else:
-                QMessageBox.critical(self, "Ошибка", f"Запись с ID {model_id} не найдена")
+            model_id = int(model_id)
         except ValueError:
             QMessageBox.critical(self, "Ошибка", "Неверный формат ID модели")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении: {e}")
+            return
 
-    def refresh_data(self):
-        self.model.refresh()
+        self.delete_btn.setEnabled(False)
+        start_db_task(
+            run_readwrite, delete_record, "ai_models", "model_id", model_id,
+            on_finished=lambda deleted: self._on_deleted(model_id, deleted),
+            on_failed=self._on_delete_failed
+        )
+
+    def _on_deleted(self, model_id, deleted):
+        self.delete_btn.setEnabled(True)
+        if deleted:
+            self.refresh_data()
+            QMessageBox.information(self, "Успех", f"Модель с ID {model_id} удалена")
+        else:
+            QMessageBox.critical(self, "Ошибка", f"Запись с ID {model_id} не найдена")
+
+    def _on_delete_failed(self, e):
+        self.delete_btn.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении: {e}")
+
+    def refresh_data(self, force: bool = False):
+        self.model.refresh(force)
 
 class AttacksTab(QWidget):
-    def __init__(self, conn, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.conn = conn
-        self.model = PostgreSQLTableModel(conn, "ddos_attacks", self)
+        self.model = shared_model("ddos_attacks", DISPLAY_COLUMNS["ddos_attacks"])
         self.setup_ui()
+        self.update_row_estimate()
 
     def setup_ui(self):
        
-        title_label = QLabel("Управление DDoS атаками")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 18px;
-                font-weight: bold;
-                color: white;
-                padding: 10px;
-                background-color: #e74c3c;
-                border-radius: 8px;
-            }
-        """)
-        title_label.setAlignment(Qt.AlignCenter)
+        title_label = create_title_label("Управление DDoS атаками", "attacksTitle")
 
        
         form_group = create_group_box("Добавить новую атаку")
@@ -184,7 +243,7 @@ class AttacksTab(QWidget):
         self.target_ip_edit = QLineEdit()
         self.target_ip_edit.setPlaceholderText("10.0.0.50")
         self.attack_type_cb = QComboBox()
-        self.attack_type_cb.addItems(['udp_flood', 'icmp_flood', 'http_flood', 'syn_flood'])
+        self.attack_type_cb.addItems(ATTACK_TYPES)
         self.packet_count_spin = QSpinBox()
         self.packet_count_spin.setRange(1, 1000000)
         self.packet_count_spin.setValue(1000)
@@ -192,7 +251,7 @@ class AttacksTab(QWidget):
         self.duration_spin.setRange(1, 3600)
         self.duration_spin.setValue(60)
         self.ports_edit = QLineEdit()
-        self.ports_edit.setPlaceholderText("80,443")
+        self.ports_edit.setPlaceholderText("80,443,8000-8010")
 
         form_layout.addRow("Исходный IP:", self.source_ip_edit)
         form_layout.addRow("Целевой IP:", self.target_ip_edit)
@@ -208,17 +267,22 @@ class AttacksTab(QWidget):
         self.delete_btn = create_styled_button("Удалить", STYLES["danger_color"])
         self.delete_btn.clicked.connect(self.delete_selected)
         self.refresh_btn = create_styled_button("Обновить", STYLES["accent_color"])
-        self.refresh_btn.clicked.connect(self.refresh_data)
+        self.refresh_btn.clicked.connect(lambda: self.refresh_data(force=True))
+        self.import_btn = create_styled_button("Импорт CSV", STYLES["primary_color"])
+        self.import_btn.clicked.connect(self.import_csv)
 
         buttons_layout = QHBoxLayout()
         buttons_layout.addWidget(self.add_btn)
         buttons_layout.addWidget(self.delete_btn)
         buttons_layout.addWidget(self.refresh_btn)
+        buttons_layout.addWidget(self.import_btn)
         buttons_layout.addStretch()
 
        
         table_group = create_group_box("Список атак")
         table_layout = QVBoxLayout()
+        self.count_label = QLabel()
+        table_layout.addWidget(self.count_label)
         self.table = create_table()
         self.table.setModel(self.model)
         table_layout.addWidget(self.table)
@@ -245,51 +309,82 @@ class AttacksTab(QWidget):
         target_ports = None
         if ports_text:
             try:
-                target_ports = [int(p) for p in ports_text.split(',')]
+                target_ports = parse_ports(ports_text)
             except ValueError:
-                QMessageBox.warning(self, "Ошибка", "Порты должны быть числами, разделёнными запятыми")
+                QMessageBox.warning(self, "Ошибка", "Порты должны быть числами от 0 до 65535 или диапазонами (22-25), разделёнными запятыми")
                 return
 
         if not source_ip or not target_ip or not attack_type:
             QMessageBox.warning(self, "Ошибка", "IP-адреса и тип атаки обязательны")
             return
 
-        if not check_table_exists(self.conn, "ddos_attacks"):
+        if attack_type not in ATTACK_TYPES:
+            QMessageBox.warning(self, "Ошибка", f"Неверный тип атаки (должен быть одним из: {', '.join(ATTACK_TYPES)})")
+            return
+
+        self.add_btn.setEnabled(False)
+        start_db_task(
+            insert_if_table_exists, "ddos_attacks", insert_attack,
+            source_ip, target_ip, attack_type, packet_count, duration, target_ports,
+            on_finished=self._on_attack_added, on_failed=self._on_add_failed
+        )
+
+    def add_attacks_bulk(self, rows):
+        self.add_btn.setEnabled(False)
+        start_db_task(
+            insert_if_table_exists, "ddos_attacks", insert_attacks, rows,
+            on_finished=self._on_bulk_added, on_failed=self._on_bulk_failed
+        )
+
+    def import_csv(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Импорт атак", "", "CSV (*.csv)")
+        if not path:
+            return
+
+        self.add_btn.setEnabled(False)
+        start_db_task(
+            insert_if_table_exists, "ddos_attacks", load_attacks_csv, path,
+            on_finished=self._on_bulk_added, on_failed=self._on_bulk_failed
+        )
+
+    def _on_bulk_added(self, count):
+        self.add_btn.setEnabled(True)
+        if count is None:
+            QMessageBox.critical(self, "Ошибка", "Таблица 'ddos_attacks' не существует. Создайте её в БД.")
+            return
+        self.refresh_data()
+        QMessageBox.information(self, "Успех", f"Добавлено атак: {count}")
+
+    def _on_bulk_failed(self, e):
+        self.add_btn.setEnabled(True)
+        diag = getattr(e, "diag", None)
+        message = diag.message_primary if diag is not None and diag.message_primary else e
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при загрузке атак: {message}")
+
+    def _on_attack_added(self, record):
+        self.add_btn.setEnabled(True)
+        if record is None:
             QMessageBox.critical(self, "Ошибка", "Таблица 'ddos_attacks' не существует. Создайте её в БД.")
             return
 
-        try:
-            with self.conn:
-                with self.conn.cursor() as cur:
-                    if target_ports:
-                        cur.execute(
-                            "INSERT INTO ddos_attacks (source_ip, target_ip, attack_type, packet_count, duration_seconds, target_ports) VALUES (%s, %s, %s, %s, %s, %s)",
-                            (source_ip, target_ip, attack_type, packet_count, duration, target_ports)
-                        )
-                    else:
-                        cur.execute(
-                            "INSERT INTO ddos_attacks (source_ip, target_ip, attack_type, packet_count, duration_seconds) VALUES (%s, %s, %s, %s, %s)",
-                            (source_ip, target_ip, attack_type, packet_count, duration)
-                        )
-        
+        if not self.model.append_row(record):
             self.refresh_data()
-            self.source_ip_edit.clear()
-            self.target_ip_edit.clear()
-            self.attack_type_cb.setCurrentIndex(0)
-            self.packet_count_spin.setValue(1000)
-            self.duration_spin.setValue(60)
-            self.ports_edit.clear()
-            QMessageBox.information(self, "Успех", "Атака успешно добавлена!")
-        
-        except errors.InvalidTextRepresentation:
-            QMessageBox.critical(self, "Ошибка", "Неверный тип атаки (должен быть одним из: udp_flood, icmp_flood, http_flood, syn_flood)")
-            self.conn.rollback()
-        except errors.ProgrammingError as e:
+        self.source_ip_edit.clear()
+        self.target_ip_edit.clear()
+        self.attack_type_cb.setCurrentIndex(0)
+        self.packet_count_spin.setValue(1000)
+        self.duration_spin.setValue(60)
+        self.ports_edit.clear()
+        QMessageBox.information(self, "Успех", "Атака успешно добавлена!")
+
+    def _on_add_failed(self, e):
+        self.add_btn.setEnabled(True)
+        if isinstance(e, errors.InvalidTextRepresentation):
+            QMessageBox.critical(self, "Ошибка", f"Неверный тип атаки (должен быть одним из: {', '.join(ATTACK_TYPES)})")
+        elif isinstance(e, errors.ProgrammingError):
             QMessageBox.critical(self, "Ошибка", f"Ошибка в запросе (возможно, неверный тип данных): {e}")
-            self.conn.rollback()
-        except Exception as e:
+        else:
             QMessageBox.critical(self, "Ошибка", f"Неизвестная ошибка при добавлении: {e}")
-            self.conn.rollback()
 
     def delete_selected(self):
         selected = self.table.selectionModel().selectedRows()
@@ -304,41 +399,53 @@ class AttacksTab(QWidget):
             return
 
         try:
-            attack_id = int(attack_id) 
-            if delete_record(self.conn, "ddos_attacks", "attack_id", attack_id):
-                self.refresh_data()
-                QMessageBox.information(self, "Успех", f"Атака с ID {attack_id} удалена")
-            else:
-                QMessageBox.critical(self, "Ошибка", f"Запись с ID {attack_id} не найдена")
+            attack_id = int(attack_id)
         except ValueError:
             QMessageBox.critical(self, "Ошибка", "Неверный формат ID атаки")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении: {e}")
+            return
+
+        self.delete_btn.setEnabled(False)
+        start_db_task(
+            run_readwrite, delete_record, "ddos_attacks", "attack_id", attack_id,
+            on_finished=lambda deleted: self._on_deleted(attack_id, deleted),
+            on_failed=self._on_delete_failed
+        )
+
+    def _on_deleted(self, attack_id, deleted):
+        self.delete_btn.setEnabled(True)
+        if deleted:
+            self.refresh_data()
+            QMessageBox.information(self, "Успех", f"Атака с ID {attack_id} удалена")
+        else:
+            QMessageBox.critical(self, "Ошибка", f"Запись с ID {attack_id} не найдена")
+
+    def _on_delete_failed(self, e):
+        self.delete_btn.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении: {e}")
 
-    def refresh_data(self):
-        self.model.refresh()
+    def refresh_data(self, force: bool = False):
+        self.model.refresh(force)
+        self.update_row_estimate()
+
+    def update_row_estimate(self):
+        start_db_task(
+            run_readonly, estimate_row_count, "ddos_attacks",
+            on_finished=self._on_row_estimate
+        )
+
+    def _on_row_estimate(self, count):
+        self.count_label.setText(f"Записей: ~{count}" if count is not None else "")
 
 class SetupTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.conn = None
+        self.connected = False
         self.cfg = PgConfig()
         self.setup_ui()
 
     def setup_ui(self):
       
-        title_label = QLabel("Настройка подключения к БД")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 18px;
-                font-weight: bold;
-                color: white;
-                padding: 10px;
-                background-color: #2ecc71;
-                border-radius: 8px;
-            }
-        """)
-        title_label.setAlignment(Qt.AlignCenter)
+        title_label = create_title_label("Настройка подключения к БД", "setupTitle")
 
        
         conn_group = create_group_box("Параметры подключения")
@@ -352,19 +459,6 @@ class SetupTab(QWidget):
         self.pw_edit.setEchoMode(QLineEdit.Password)
 
        
-        for edit in [self.host_edit, self.port_edit, self.db_edit, self.user_edit, self.pw_edit]:
-            edit.setStyleSheet("""
-                QLineEdit {
-                    padding: 6px;
-                    border: 2px solid #bdc3c7;
-                    border-radius: 4px;
-                    background-color: white;
-                }
-                QLineEdit:focus {
-                    border-color: #3498db;
-                }
-            """)
-
         conn_layout.addRow("Хост:", self.host_edit)
         conn_layout.addRow("Порт:", self.port_edit)
         conn_layout.addRow("База данных:", self.db_edit)
@@ -387,18 +481,10 @@ class SetupTab(QWidget):
       
         log_group = create_group_box("Журнал событий")
         log_layout = QVBoxLayout()
-        self.log = QTextEdit()
+        self.log = QPlainTextEdit()
         self.log.setReadOnly(True)
-        self.log.setStyleSheet("""
-            QTextEdit {
-                background-color: #2c3e50;
-                color: #ecf0f1;
-                border: 1px solid #34495e;
-                border-radius: 4px;
-                font-family: 'Courier New';
-                font-size: 10px;
-            }
-        """)
+        self.log.setMaximumBlockCount(LOG_MAX_LINES)
+        self.log.setObjectName("eventLog")
         log_layout.addWidget(self.log)
         log_group.setLayout(log_layout)
 
@@ -428,26 +514,30 @@ class SetupTab(QWidget):
             sslmode=self.cfg.sslmode
         )
 
+    def _log(self, message: str):
+        self.log.appendPlainText(f"[{time.strftime('%H:%M:%S')}] {message}")
+
     def connect_db(self):
         cfg = self.get_config()
-        self.conn = create_connection(cfg)
-        
-        if self.conn:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log.append(f"[{timestamp}] Подключено к {cfg.host}:{cfg.port}/{cfg.dbname}")
+        self.connect_btn.setEnabled(False)
+        start_db_task(open_pool, cfg, on_finished=lambda ok: self._on_connected(cfg, ok))
+
+    def _on_connected(self, cfg, ok):
+        self.connected = ok
+        if self.connected:
+            self._log(f"Подключено к {cfg.host}:{cfg.port}/{cfg.dbname}")
             self.connect_btn.setEnabled(False)
             self.disconnect_btn.setEnabled(True)
-            self.window().on_connection_established(self.conn)
+            self.window().on_connection_established()
         else:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.log.append(f"[{timestamp}] Ошибка подключения к БД")
+            self._log("Ошибка подключения к БД")
+            self.connect_btn.setEnabled(True)
 
     def disconnect_db(self):
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log.append(f"[{timestamp}] Отключено от БД")
+        if self.connected:
+            close_pool()
+            self.connected = False
+        self._log("Отключено от БД")
         self.connect_btn.setEnabled(True)
         self.disconnect_btn.setEnabled(False)
         self.window().on_connection_closed()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import logging
+from PySide6.QtCore import QObject, QRunnable, QSocketNotifier, QThreadPool, Signal
+from database import (
+    PAGE_SIZE, fetch_page, pooled_connection, open_listener,
+    parse_notify, bump_table_version
+)
+
+class FetchSignals(QObject):
+    page = Signal(object, object, object)
+
+class FetchRunnable(QRunnable):
+    def __init__(self, table_name: str, after=None, limit: int = PAGE_SIZE,
+                 columns=None, order_by=None, descending: bool = False):
+        super().__init__()
+        self.table_name = table_name
+        self.after = after
+        self.limit = limit
+        self.columns = columns
+        self.order_by = order_by
+        self.descending = descending
+        self.signals = FetchSignals()
+
+    def run(self):
+       
+        columns, rows, pk_column = [], [], None
+        try:
+            with pooled_connection(readonly=True) as conn:
+                columns, rows, pk_column = fetch_page(
+                    conn, self.table_name, self.limit, self.after,
+                    self.columns, self.order_by, self.descending
+                )
+        except Exception as e:
+            logging.error("Ошибка фоновой загрузки %s: %s", self.table_name, e)
+        self.signals.page.emit(columns, rows, pk_column)
+
+
+class TaskSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(object)
+
+class DbTask(QRunnable):
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = TaskSignals()
+
+    def run(self):
+       
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            logging.error("Ошибка фоновой операции с БД: %s", e)
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+_pending_tasks = set()
+
+def start_db_task(fn, *args, on_finished, on_failed=None):
+   
+    task = DbTask(fn, *args)
+    signals = task.signals
+    _pending_tasks.add(signals)
+    signals.finished.connect(on_finished)
+    if on_failed is not None:
+        signals.failed.connect(on_failed)
+    signals.finished.connect(lambda _: _pending_tasks.discard(signals))
+    signals.failed.connect(lambda _: _pending_tasks.discard(signals))
+    QThreadPool.globalInstance().start(task)
+
+class TableWatcher(QObject):
+    changed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.conn = None
+        self.notifier = None
+        self._task = None
+
+    def start(self):
+       
+        task = DbTask(open_listener)
+        task.signals.finished.connect(self._on_listening)
+        self._task = task.signals
+        QThreadPool.globalInstance().start(task)
+
+    def _on_listening(self, conn):
+        if self._task is None:
+            conn.close()
+            return
+        self._task = None
+        self.conn = conn
+        self.notifier = QSocketNotifier(conn.fileno(), QSocketNotifier.Read, self)
+        self.notifier.activated.connect(self._drain)
+
+    def _drain(self):
+       
+        try:
+            self.conn.poll()
+        except Exception as e:
+            logging.error("Ошибка получения уведомлений: %s", e)
+            self.close()
+            return
+        tables = set()
+        while self.conn.notifies:
+            table_name, own = parse_notify(self.conn.notifies.pop(0).payload)
+            if not own:
+                tables.add(table_name)
+        for table_name in tables:
+            bump_table_version(table_name)
+            self.changed.emit(table_name)
+
+    def close(self):
+       
+        self._task = None
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+            self.notifier.deleteLater()
+            self.notifier = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
\ No newline at end of file